@@ -3,14 +3,58 @@
 API Client - Use weather app via REST API
 """
 
+import threading
 import requests
-import json
+from concurrent.futures import ThreadPoolExecutor
+
+from resilience import RETRY_STATUSES, TransientError, with_retry
+
+REQUEST_TIMEOUT = 10
+
+# (emoji, label, key) rows printed for a current weather response
+CURRENT_WEATHER_FIELDS = (
+    ("📍", "Location", "location"),
+    ("🌡️", "Temperature", "temperature"),
+    ("💨", "Feels like", "feels_like"),
+    ("💧", "Humidity", "humidity"),
+    ("☁️", "Conditions", "description"),
+    ("🌪️", "Wind", "wind_speed"),
+    ("📊", "Pressure", "pressure"),
+    ("👁️", "Visibility", "visibility"),
+    ("⏰", "Updated", "timestamp"),
+)
 
 class WeatherAPIClient:
     """Client for weather REST API"""
     
     def __init__(self, base_url="http://localhost:5001"):
         self.base_url = base_url
+        self._local = threading.local()
+        
+    @property
+    def session(self) -> requests.Session:
+        """This thread's Session (keep-alive connection reuse).
+        
+        requests doesn't guarantee Session is thread-safe, and main() calls the
+        client from a thread pool, so each thread gets its own.
+        """
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+        
+    def _request(self, method: str, url: str, **kwargs):
+        """Send a request, retrying transient failures with backoff"""
+        def send():
+            try:
+                response = self.session.request(method, url, timeout=REQUEST_TIMEOUT, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                raise TransientError(str(e)) from e
+            if response.status_code in RETRY_STATUSES:
+                raise TransientError(f"HTTP {response.status_code}")
+            return response
+            
+        return with_retry(send)
         
     def get_current_weather(self, location: str):
         """Get current weather via API"""
@@ -18,7 +62,7 @@ class WeatherAPIClient:
         data = {"location": location}
         
         try:
-            response = requests.post(url, json=data)
+            response = self._request("POST", url, json=data)
             return response.json()
         except Exception as e:
             return {"error": str(e)}
@@ -29,7 +73,7 @@ class WeatherAPIClient:
         data = {"location": location, "days": days}
         
         try:
-            response = requests.post(url, json=data)
+            response = self._request("POST", url, json=data)
             return response.json()
         except Exception as e:
             return {"error": str(e)}
@@ -39,7 +83,7 @@ class WeatherAPIClient:
         url = f"{self.base_url}/api/status"
         
         try:
-            response = requests.get(url)
+            response = self._request("GET", url)
             return response.json()
         except Exception as e:
             return {"error": str(e)}
@@ -52,19 +96,13 @@ def print_api_response(response, title):
     if response.get("success"):
         data = response.get("data", {})
         if "location" in data:
-            print(f"📍 Location: {data['location']}")
-            print(f"🌡️ Temperature: {data.get('temperature', 'N/A')}")
-            print(f"💨 Feels like: {data.get('feels_like', 'N/A')}")
-            print(f"💧 Humidity: {data.get('humidity', 'N/A')}")
-            print(f"☁️ Conditions: {data.get('description', 'N/A')}")
-            print(f"🌪️ Wind: {data.get('wind_speed', 'N/A')}")
-            print(f"📊 Pressure: {data.get('pressure', 'N/A')}")
-            print(f"👁️ Visibility: {data.get('visibility', 'N/A')}")
-            print(f"⏰ Updated: {data.get('timestamp', 'N/A')}")
+            print("\n".join(f"{emoji} {label}: {data.get(key, 'N/A')}"
+                            for emoji, label, key in CURRENT_WEATHER_FIELDS))
         elif "forecast" in data:
-            print(f"📅 Forecast for {data['location']}:")
-            for i, item in enumerate(data['forecast'][:6]):
-                print(f"   {i+1}. {item['timestamp']}: {item['temperature']}, {item['description']}")
+            lines = [f"📅 Forecast for {data['location']}:"]
+            lines.extend(f"   {i}. {item['timestamp']}: {item['temperature']}, {item['description']}"
+                         for i, item in enumerate(data['forecast'][:6], 1))
+            print("\n".join(lines))
     else:
         print(f"❌ Error: {response.get('error', 'Unknown error')}")
 
@@ -82,17 +120,22 @@ def main():
     # Test cities
     cities = ["Kolkata", "Delhi", "Mumbai"]
     
-    for city in cities:
+    def fetch_city(city):
+        return client.get_current_weather(city), client.get_weather_forecast(city, 3)
+    
+    # Fetch all cities concurrently, then print in order
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(fetch_city, cities))
+    
+    for city, (weather_response, forecast_response) in zip(cities, results):
         print(f"\n{'='*60}")
         print(f"📍 Testing {city}")
         print('='*60)
         
-        # Get current weather
-        weather_response = client.get_current_weather(city)
+        # Current weather
         print_api_response(weather_response, f"Current Weather for {city}")
         
-        # Get forecast
-        forecast_response = client.get_weather_forecast(city, 3)
+        # Forecast
         print_api_response(forecast_response, f"3-Day Forecast for {city}")
 
 if __name__ == "__main__":
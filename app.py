@@ -5,29 +5,83 @@ A simple Flask web application for the weather agent
 """
 
 import asyncio
+import atexit
+import concurrent.futures
 import json
 import os
+import threading
 from datetime import datetime
-from flask import Flask, render_template, request, jsonify
+import orjson
+from flask import Flask, Response, render_template, request
 from dotenv import load_dotenv
-from weather_mcp_agent import WeatherMCPAgent
+from weather_mcp_agent import UPSTREAM_BUDGET, WeatherMCPAgent
+
+try:
+    import uvloop
+except ImportError:  # uvloop is optional (not available on Windows)
+    uvloop = None
 
 # Load environment variables
 load_dotenv()
 
 app = Flask(__name__)
 
+# Single long-lived event loop shared by all requests, running in its own thread
+LOOP = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
+threading.Thread(target=LOOP.run_forever, daemon=True).start()
+
+# Long enough for the agent to finish all its retries (plus a little slack), so
+# retries can help the web path and the breaker sees their outcome
+REQUEST_TIMEOUT = UPSTREAM_BUDGET + 1
+
+# API key status never changes while the app runs, so encode the response once
+_API_KEY = os.getenv("OPENWEATHER_API_KEY") or ""
+_STATUS_BODY = orjson.dumps({
+    'api_key_configured': bool(_API_KEY),
+    'api_key_length': len(_API_KEY)
+})
+
 # Initialize weather agent
 weather_agent = None
 
-async def get_weather_agent():
-    """Get or create weather agent instance"""
+async def _ensure_agent():
+    """Create and initialize the weather agent on the shared loop"""
     global weather_agent
     if weather_agent is None:
         weather_agent = WeatherMCPAgent()
         await weather_agent.initialize()
     return weather_agent
 
+def run_async(coro, timeout=REQUEST_TIMEOUT):
+    """Run a coroutine on the shared event loop and wait for its result"""
+    future = asyncio.run_coroutine_threadsafe(coro, LOOP)
+    try:
+        return future.result(timeout)
+    except concurrent.futures.TimeoutError:
+        # Stop the coroutine instead of leaving it running on LOOP, and give the
+        # handlers a message (str() of the bare timeout is empty)
+        future.cancel()
+        raise TimeoutError("Upstream request timed out") from None
+
+def _json_response(payload) -> Response:
+    """Encode an API response with orjson (faster than jsonify for the forecast lists)"""
+    return Response(orjson.dumps(payload), mimetype='application/json')
+
+def get_weather_agent_sync():
+    """Return the process-wide weather agent"""
+    return weather_agent or run_async(_ensure_agent())
+
+def _shutdown():
+    """Close the agent's HTTP session and stop the shared loop"""
+    if weather_agent is not None:
+        run_async(weather_agent.cleanup())
+    LOOP.call_soon_threadsafe(LOOP.stop)
+
+# Create the agent up front so its aiohttp session (and keep-alive pool)
+# lives on the shared loop for the lifetime of the app
+run_async(_ensure_agent())
+atexit.register(_shutdown)
+
 @app.route('/')
 def index():
     """Main page"""
@@ -40,40 +94,22 @@ def get_current_weather():
         data = request.get_json()
         location = data.get('location', 'London')
         
-        # Run async function
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        async def fetch_weather():
-            agent = await get_weather_agent()
-            return await agent.get_current_weather(location)
-        
-        weather_data = loop.run_until_complete(fetch_weather())
-        loop.close()
+        agent = get_weather_agent_sync()
+        weather_data = run_async(agent.get_current_weather_display(location))
         
         if weather_data:
-            return jsonify({
+            return _json_response({
                 'success': True,
-                'data': {
-                    'location': weather_data.location,
-                    'temperature': f"{weather_data.temperature}°C",
-                    'feels_like': f"{weather_data.feels_like}°C",
-                    'humidity': f"{weather_data.humidity}%",
-                    'description': weather_data.description,
-                    'wind_speed': f"{weather_data.wind_speed} m/s",
-                    'pressure': f"{weather_data.pressure} hPa",
-                    'visibility': f"{weather_data.visibility} m",
-                    'timestamp': weather_data.timestamp.isoformat()
-                }
+                'data': weather_data
             })
         else:
-            return jsonify({
+            return _json_response({
                 'success': False,
                 'error': f'Failed to fetch weather data for {location}'
             })
             
     except Exception as e:
-        return jsonify({
+        return _json_response({
             'success': False,
             'error': str(e)
         })
@@ -86,29 +122,11 @@ def get_weather_forecast():
         location = data.get('location', 'London')
         days = data.get('days', 5)
         
-        # Run async function
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        async def fetch_forecast():
-            agent = await get_weather_agent()
-            return await agent.get_forecast(location, days)
+        agent = get_weather_agent_sync()
+        forecast_data = run_async(agent.get_forecast_raw(location, days))
         
-        forecasts = loop.run_until_complete(fetch_forecast())
-        loop.close()
-        
-        if forecasts:
-            forecast_data = []
-            for forecast in forecasts:
-                forecast_data.append({
-                    'timestamp': forecast.timestamp.isoformat(),
-                    'temperature': f"{forecast.temperature}°C",
-                    'description': forecast.description,
-                    'humidity': f"{forecast.humidity}%",
-                    'wind_speed': f"{forecast.wind_speed} m/s"
-                })
-            
-            return jsonify({
+        if forecast_data:
+            return _json_response({
                 'success': True,
                 'data': {
                     'location': location,
@@ -116,13 +134,13 @@ def get_weather_forecast():
                 }
             })
         else:
-            return jsonify({
+            return _json_response({
                 'success': False,
                 'error': f'Failed to fetch forecast for {location}'
             })
             
     except Exception as e:
-        return jsonify({
+        return _json_response({
             'success': False,
             'error': str(e)
         })
@@ -130,11 +148,7 @@ def get_weather_forecast():
 @app.route('/api/status')
 def status():
     """API endpoint to check if API key is configured"""
-    api_key = os.getenv("OPENWEATHER_API_KEY")
-    return jsonify({
-        'api_key_configured': bool(api_key),
-        'api_key_length': len(api_key) if api_key else 0
-    })
+    return Response(_STATUS_BODY, mimetype='application/json')
 
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5001)
@@ -37,7 +37,7 @@ async def weather_llm_example():
 🌪️ Wind Speed: {weather_data.wind_speed} m/s
 📊 Pressure: {weather_data.pressure} hPa
 👁️ Visibility: {weather_data.visibility} m
-⏰ Last updated: {weather_data.timestamp.strftime('%Y-%m-%d %H:%M')}
+⏰ Last updated: {weather_data.timestamp.strftime('%Y-%m-%d %H:%M UTC')}
             """
             print(response)
         else:
@@ -54,7 +54,7 @@ async def weather_llm_example():
 
 """
             for i, forecast in enumerate(forecasts[:8]):  # Show 8 forecasts (about 1 day)
-                response += f"📅 {forecast.timestamp.strftime('%m/%d %H:%M')}: "
+                response += f"📅 {forecast.timestamp.strftime('%m/%d %H:%M UTC')}: "
                 response += f"{forecast.temperature}°C, {forecast.description}\n"
             
             print(response)
@@ -105,7 +105,7 @@ async def mcp_tool_example():
       "wind_speed": "3.2 m/s",
       "pressure": "1013 hPa",
       "visibility": "10000 m",
-      "timestamp": "2024-01-15T14:30:00"
+      "timestamp": "2024-01-15T14:30:00+00:00"
     }
     """)
 
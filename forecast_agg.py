@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Forecast Aggregation - Per-day summaries of 3-hourly forecast entries
+"""
+
+from collections import Counter
+from datetime import date
+from typing import Any, List, Tuple
+
+# The OpenWeather forecast endpoint covers at most 5 days (8 entries per day)
+MAX_FORECAST_DAYS = 5
+
+def valid_forecast_days(days: Any) -> bool:
+    """Whether days is an integer forecast length the API can serve"""
+    return isinstance(days, int) and not isinstance(days, bool) and 1 <= days <= MAX_FORECAST_DAYS
+
+# Indexed by date.weekday(); avoids a strftime('%A') call per day
+WEEKDAY_NAMES = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+def daily_summary(forecasts) -> List[Tuple[date, float, str]]:
+    """Summarize forecasts as (day, average temperature, most common description), in date order"""
+    daily_forecasts = {}
+    for forecast in forecasts or ():
+        daily_forecasts.setdefault(forecast.timestamp.date(), []).append(forecast)
+
+    summary = []
+    for day, day_forecasts in daily_forecasts.items():
+        avg_temp = sum(f.temperature for f in day_forecasts) / len(day_forecasts)
+        most_common_desc = Counter(f.description for f in day_forecasts).most_common(1)[0][0]
+        summary.append((day, avg_temp, most_common_desc))
+    return summary
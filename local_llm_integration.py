@@ -5,53 +5,74 @@ import warnings
 os.environ["TOKENIZERS_PARALLELISM"] = "false"
 warnings.filterwarnings("ignore")
 
+import atexit
+import itertools
 import subprocess
 import json
-import time
 
-from transformers.pipelines import pipeline
+
+# Long-lived MCP server process, reused across tool calls
+_PROC = None
+_IDS = itertools.count(1)
+
+
+def _send(proc, message):
+    proc.stdin.write(json.dumps(message) + "\n")
+    proc.stdin.flush()
+    return proc.stdout.readline()
+
+
+def _get_mcp_server():
+    """Start the MCP server once and complete the initialize handshake"""
+    global _PROC
+    if _PROC is None or _PROC.poll() is not None:
+        _PROC = subprocess.Popen(
+            ["python", "mcp_server.py"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            bufsize=1
+        )
+        atexit.register(_PROC.terminate)
+        if _PROC.stdin and _PROC.stdout:
+            _send(_PROC, {"jsonrpc": "2.0", "id": next(_IDS), "method": "initialize", "params": {}})
+    return _PROC
 
 
 def call_mcp_tool(location):
     message = {
         "jsonrpc": "2.0",
-        "id": 1,
+        "id": next(_IDS),
         "method": "tools/call",
         "params": {
             "name": "get_current_weather",
             "arguments": {"location": location}
         }
     }
-    proc = subprocess.Popen(
-        ["python", "mcp_server.py"],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True
-    )
-    time.sleep(1)
     response = None
     try:
+        proc = _get_mcp_server()
         if proc.stdin and proc.stdout:
-            proc.stdin.write(json.dumps(message) + "\n")
-            proc.stdin.flush()
-            response = proc.stdout.readline()
+            response = _send(proc, message)
         else:
             response = "Error: Subprocess pipes are not available. Please run this script in a standard terminal."
     except Exception as e:
         response = f"Error communicating with MCP server: {e}"
-    finally:
-        proc.terminate()
     return response
 
 if __name__ == "__main__":
     MODEL = "sshleifer/tiny-gpt2"  # Use a tiny model for fast local inference
 
-    generator = pipeline("text-generation", model=MODEL)
-
     user_location = input("Enter a city or location: ")
     user_question = f"What is the weather in {user_location}?"
 
+    # Imported lazily: transformers pulls in torch and tokenizers, which takes seconds
+    from transformers.pipelines import pipeline
+
+    generator = pipeline("text-generation", model=MODEL)
+
     try:
         result = generator(user_question, max_length=60, num_return_sequences=1)
         if result and isinstance(result, list) and "generated_text" in result[0]:
@@ -5,15 +5,23 @@ Provides standardized MCP interface for LLMs to access weather data
 """
 
 import asyncio
-import json
+import functools
 import logging
 import os
 import sys
+from collections import OrderedDict
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
+import orjson
 from dotenv import load_dotenv
-from weather_mcp_agent import WeatherMCPAgent
+
+from forecast_agg import MAX_FORECAST_DAYS, valid_forecast_days
+
+try:
+    import uvloop
+except ImportError:  # uvloop is optional (not available on Windows)
+    uvloop = None
 
 # Load environment variables
 load_dotenv()
@@ -22,15 +30,41 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Last-known-good results kept for the circuit breaker's stale fallback
+# (fresh responses are cached by WeatherMCPAgent itself)
+STALE_CACHE_SIZE = 256
+
+# Result of the initialize handshake; constant, so built once
+INITIALIZE_RESULT = {
+    "protocolVersion": "2024-11-05",
+    "capabilities": {
+        "tools": {}
+    },
+    "serverInfo": {
+        "name": "weather-mcp-agent",
+        "version": "1.0.0"
+    }
+}
+
 class MCPServer:
     """Simple MCP Server for Weather Agent"""
     
     def __init__(self):
+        # Imported here so aiohttp and the MCP SDK load only once a server is created
+        from weather_mcp_agent import WeatherMCPAgent
+        
         self.weather_agent = WeatherMCPAgent()
         self.initialized = False
+        self._last_good: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+        # The agent's breaker makes upstream calls fail fast once OpenWeather keeps failing
+        self._breaker = self.weather_agent.breaker
+        # The tool list never changes, so build the tools/list result once
+        self._tools_result = {"tools": self.get_tools()}
         
     async def initialize(self):
         """Initialize the MCP server"""
+        if self.initialized:
+            return
         await self.weather_agent.initialize()
         self.initialized = True
         logger.info("MCP Server initialized")
@@ -39,6 +73,25 @@ class MCPServer:
         """Cleanup resources"""
         await self.weather_agent.cleanup()
         
+    async def _fetch_or_stale(self, key: Tuple, fetch: Callable[[], Awaitable[Any]],
+                              error: str) -> Dict[str, Any]:
+        """Fetch a tool result, falling back to the last good one while upstream is down"""
+        result = await fetch()
+        if result:
+            self._last_good[key] = result
+            self._last_good.move_to_end(key)
+            if len(self._last_good) > STALE_CACHE_SIZE:
+                self._last_good.popitem(last=False)
+            return result
+        elif self._breaker.is_open:
+            # Upstream is failing; serve the last known value (if any) without waiting
+            return {
+                "error": "upstream_unavailable",
+                "stale": self._last_good.get(key)
+            }
+        else:
+            return {"error": error}
+            
     def get_tools(self) -> List[Dict[str, Any]]:
         """Get available tools"""
         return [
@@ -69,7 +122,30 @@ class MCPServer:
                         "days": {
                             "type": "integer",
                             "description": "Number of days (default: 5)",
-                            "default": 5
+                            "default": 5,
+                            "minimum": 1,
+                            "maximum": MAX_FORECAST_DAYS
+                        }
+                    },
+                    "required": ["location"]
+                }
+            },
+            {
+                "name": "get_weather_report",
+                "description": "Get current weather and forecast for a location in one call",
+                "inputSchema": {
+                    "type": "object",
+                    "properties": {
+                        "location": {
+                            "type": "string",
+                            "description": "City name or coordinates"
+                        },
+                        "days": {
+                            "type": "integer",
+                            "description": "Number of forecast days (default: 5)",
+                            "default": 5,
+                            "minimum": 1,
+                            "maximum": MAX_FORECAST_DAYS
                         }
                     },
                     "required": ["location"]
@@ -77,6 +153,20 @@ class MCPServer:
             }
         ]
         
+    async def _fetch_current(self, location: str) -> Optional[Dict[str, Any]]:
+        """Fetch current weather, formatted as a tool result"""
+        return await self.weather_agent.get_current_weather_display(location)
+        
+    async def _fetch_forecast(self, location: str, days: int) -> Optional[Dict[str, Any]]:
+        """Fetch a forecast, formatted as a tool result"""
+        forecasts = await self.weather_agent.get_forecast_raw(location, days)
+        if not forecasts:
+            return None
+        return {
+            "location": location,
+            "forecast": forecasts
+        }
+        
     async def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
         """Call a tool with arguments"""
         if not self.initialized:
@@ -84,52 +174,55 @@ class MCPServer:
             
         if tool_name == "get_current_weather":
             location = arguments.get("location")
-            if not location:
+            if not location or not isinstance(location, str):
                 return {"error": "Location is required"}
                 
-            weather_data = await self.weather_agent.get_current_weather(location)
-            
-            if weather_data:
-                return {
-                    "location": weather_data.location,
-                    "temperature": f"{weather_data.temperature}°C",
-                    "feels_like": f"{weather_data.feels_like}°C",
-                    "humidity": f"{weather_data.humidity}%",
-                    "description": weather_data.description,
-                    "wind_speed": f"{weather_data.wind_speed} m/s",
-                    "pressure": f"{weather_data.pressure} hPa",
-                    "visibility": f"{weather_data.visibility} m",
-                    "timestamp": weather_data.timestamp.isoformat()
-                }
-            else:
-                return {"error": f"Failed to fetch weather data for {location}"}
+            location = location.strip()
+            return await self._fetch_or_stale(
+                ("current", location.lower()),
+                lambda: self._fetch_current(location),
+                f"Failed to fetch weather data for {location}"
+            )
                 
         elif tool_name == "get_weather_forecast":
             location = arguments.get("location")
             days = arguments.get("days", 5)
             
-            if not location:
+            if not location or not isinstance(location, str):
                 return {"error": "Location is required"}
                 
-            forecasts = await self.weather_agent.get_forecast(location, days)
+            if not valid_forecast_days(days):
+                return {"error": f"days must be an integer from 1 to {MAX_FORECAST_DAYS}"}
+                
+            location = location.strip()
+            return await self._fetch_or_stale(
+                ("forecast", location.lower(), days),
+                lambda: self._fetch_forecast(location, days),
+                f"Failed to fetch forecast for {location}"
+            )
+                
+        elif tool_name == "get_weather_report":
+            from weather_mcp_agent import run_concurrently
+            
+            location = arguments.get("location")
+            days = arguments.get("days", 5)
             
-            if forecasts:
-                forecast_data = []
-                for forecast in forecasts:
-                    forecast_data.append({
-                        "timestamp": forecast.timestamp.isoformat(),
-                        "temperature": f"{forecast.temperature}°C",
-                        "description": forecast.description,
-                        "humidity": f"{forecast.humidity}%",
-                        "wind_speed": f"{forecast.wind_speed} m/s"
-                    })
+            if not location or not isinstance(location, str):
+                return {"error": "Location is required"}
                 
-                return {
-                    "location": location,
-                    "forecast": forecast_data
-                }
-            else:
-                return {"error": f"Failed to fetch forecast for {location}"}
+            if not valid_forecast_days(days):
+                return {"error": f"days must be an integer from 1 to {MAX_FORECAST_DAYS}"}
+                
+            # Run both tools concurrently so they share the breaker and stale fallback
+            current, forecast = await run_concurrently(
+                self.call_tool("get_current_weather", {"location": location}),
+                self.call_tool("get_weather_forecast", {"location": location, "days": days})
+            )
+            return {
+                "location": location.strip(),
+                "current": current,
+                "forecast": forecast
+            }
         else:
             return {"error": f"Unknown tool: {tool_name}"}
             
@@ -145,25 +238,14 @@ class MCPServer:
             return {
                 "jsonrpc": "2.0",
                 "id": request_id,
-                "result": {
-                    "protocolVersion": "2024-11-05",
-                    "capabilities": {
-                        "tools": {}
-                    },
-                    "serverInfo": {
-                        "name": "weather-mcp-agent",
-                        "version": "1.0.0"
-                    }
-                }
+                "result": INITIALIZE_RESULT
             }
             
         elif method == "tools/list":
             return {
                 "jsonrpc": "2.0",
                 "id": request_id,
-                "result": {
-                    "tools": self.get_tools()
-                }
+                "result": self._tools_result
             }
             
         elif method == "tools/call":
@@ -179,7 +261,7 @@ class MCPServer:
                     "content": [
                         {
                             "type": "text",
-                            "text": json.dumps(result, indent=2)
+                            "text": orjson.dumps(result).decode()
                         }
                     ]
                 }
@@ -199,29 +281,68 @@ async def main():
     """Main function - simple MCP server over stdio"""
     server = MCPServer()
     
+    # Read stdin as native event loop pipe events instead of via the default executor
+    loop = asyncio.get_running_loop()
     try:
-        # Simple stdio-based MCP server
+        reader = asyncio.StreamReader()
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+        readline = reader.readline
+    except (ValueError, NotImplementedError):
+        # Regular files (stdin redirected from disk) and the Windows console
+        # can't be pipe transports; read them line by line in the executor
+        readline = functools.partial(loop.run_in_executor, None, sys.stdin.buffer.readline)
+    
+    # In-flight message handlers; holding references keeps tasks from being collected
+    pending = set()
+    
+    async def dispatch(message: Dict[str, Any]):
+        """Handle one message and write its response"""
+        try:
+            response = await server.handle_mcp_message(message)
+        except Exception as e:
+            logger.error("Error handling message: %s", e)
+            # Always answer, so clients waiting on this id don't hang
+            response = {
+                "jsonrpc": "2.0",
+                "id": message.get("id") if isinstance(message, dict) else None,
+                "error": {
+                    "code": -32603,
+                    "message": f"Internal error: {e}"
+                }
+            }
+        # No await between write and flush, so responses never interleave
+        sys.stdout.buffer.write(orjson.dumps(response) + b"\n")
+        sys.stdout.buffer.flush()
+    
+    try:
+        # Simple stdio-based MCP server; each message is handled in its own task so
+        # a slow upstream fetch does not hold up reading the next request
         while True:
             try:
-                line = await asyncio.get_event_loop().run_in_executor(None, sys.stdin.readline)
+                line = await readline()
                 if not line:
                     break
                     
-                message = json.loads(line.strip())
-                response = await server.handle_mcp_message(message)
-                
-                print(json.dumps(response))
-                sys.stdout.flush()
+                message = orjson.loads(line)
+                task = asyncio.create_task(dispatch(message))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
                 
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 logger.error("Invalid JSON received")
             except Exception as e:
-                logger.error(f"Error handling message: {e}")
+                logger.error("Error handling message: %s", e)
                 
     except KeyboardInterrupt:
         logger.info("Shutting down MCP Server...")
     finally:
+        # Let requests already read from stdin finish before shutting down
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
         await server.cleanup()
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
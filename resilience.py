@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Resilience helpers - retry with exponential backoff and a circuit breaker for upstream calls
+"""
+
+import asyncio
+import logging
+import random
+import time
+from contextlib import asynccontextmanager
+
+logger = logging.getLogger(__name__)
+
+# HTTP status codes worth retrying (server errors and rate limiting)
+RETRY_STATUSES = (500, 502, 503, 504, 429)
+
+class TransientError(Exception):
+    """A failure that may succeed if retried (connection error, timeout, 5xx, 429)"""
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit breaker is open"""
+
+def backoff_delay(attempt: int, base: float = 0.25, cap: float = 4.0) -> float:
+    """Exponential backoff with full jitter"""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+def max_total_backoff(max_retries: int = 3, base: float = 0.25, cap: float = 4.0) -> float:
+    """Upper bound on the total time with_retry/async_with_retry spend sleeping"""
+    return sum(min(cap, base * 2 ** attempt) for attempt in range(max_retries))
+
+def with_retry(fn, *, max_retries: int = 3, base: float = 0.25, cap: float = 4.0):
+    """Call fn(), retrying on TransientError with exponential backoff"""
+    for attempt in range(max_retries + 1):
+        try:
+            return fn()
+        except TransientError as e:
+            if attempt == max_retries:
+                raise
+            delay = backoff_delay(attempt, base, cap)
+            logger.warning("Transient error (%s), retrying in %.2fs", e, delay)
+            time.sleep(delay)
+
+async def async_with_retry(fn, *, max_retries: int = 3, base: float = 0.25, cap: float = 4.0):
+    """Await fn(), retrying on TransientError with exponential backoff"""
+    for attempt in range(max_retries + 1):
+        try:
+            return await fn()
+        except TransientError as e:
+            if attempt == max_retries:
+                raise
+            delay = backoff_delay(attempt, base, cap)
+            logger.warning("Transient error (%s), retrying in %.2fs", e, delay)
+            await asyncio.sleep(delay)
+
+class CircuitBreaker:
+    """Fail fast after repeated upstream failures.
+    
+    CLOSED lets calls through and counts consecutive failures. After
+    failure_threshold failures the breaker goes OPEN and rejects calls with
+    CircuitOpenError. Once reset_timeout has passed it is HALF_OPEN: one probe
+    call is allowed, closing the breaker on success or re-opening it on failure.
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 failure_types=(TransientError,)):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failure_types = failure_types
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+        
+    @property
+    def state(self) -> str:
+        """Current breaker state"""
+        if self._opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+        
+    @property
+    def is_open(self) -> bool:
+        """Whether a call made now would be rejected"""
+        state = self.state
+        return state == self.OPEN or (state == self.HALF_OPEN and self._probing)
+        
+    def _record_success(self):
+        self._failures = 0
+        self._opened_at = None
+        
+    def _record_failure(self):
+        self._failures += 1
+        if self._opened_at is not None or self._failures >= self.failure_threshold:
+            if self._opened_at is None:
+                logger.warning("Circuit breaker opened after %d failures", self._failures)
+            self._opened_at = time.monotonic()
+            
+    @asynccontextmanager
+    async def guard(self):
+        """Run the enclosed block through the breaker"""
+        state = self.state
+        if self.is_open:
+            raise CircuitOpenError("Circuit breaker is open")
+        if state == self.HALF_OPEN:
+            self._probing = True
+        try:
+            yield
+        except self.failure_types:
+            self._record_failure()
+            raise
+        else:
+            self._record_success()
+        finally:
+            if state == self.HALF_OPEN:
+                self._probing = False
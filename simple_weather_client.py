@@ -4,8 +4,6 @@ Simple Weather Client - Use the weather agent without frontend
 """
 
 import asyncio
-import requests
-import json
 from weather_mcp_agent import WeatherMCPAgent
 
 class SimpleWeatherClient:
@@ -58,10 +56,11 @@ def print_weather(weather):
 def print_forecast(forecasts):
     """Print forecast data nicely"""
     if forecasts:
-        print(f"📅 5-Day Forecast for {forecasts[0].location}:")
-        for i, forecast in enumerate(forecasts[:8]):
-            print(f"   {i+1}. {forecast.timestamp.strftime('%m/%d %H:%M')}: "
-                  f"{forecast.temperature}°C, {forecast.description}")
+        location = forecasts[0].location
+        print(f"📅 5-Day Forecast for {location}:")
+        for i, forecast in enumerate(forecasts[:8], 1):
+            ts = forecast.timestamp.strftime('%m/%d %H:%M UTC')
+            print(f"   {i}. {ts}: {forecast.temperature}°C, {forecast.description}")
     else:
         print("❌ Failed to fetch forecast")
 
@@ -75,18 +74,23 @@ async def main():
         # Test different cities
         cities = ["Kolkata", "Delhi", "Mumbai", "Bangalore", "Chennai"]
         
-        for city in cities:
+        # Fetch all cities concurrently, then print in order
+        results = await asyncio.gather(
+            *(client.get_weather(city) for city in cities),
+            *(client.get_forecast(city, 3) for city in cities)
+        )
+        weathers, forecasts = results[:len(cities)], results[len(cities):]
+        
+        for city, weather, forecast in zip(cities, weathers, forecasts):
             print(f"\n{'='*50}")
             print(f"📍 Getting weather for {city}")
             print('='*50)
             
-            # Get current weather
-            weather = await client.get_weather(city)
+            # Current weather
             print_weather(weather)
             
-            # Get forecast
+            # Forecast
             print(f"\n📅 Getting forecast for {city}...")
-            forecast = await client.get_forecast(city, 3)
             print_forecast(forecast)
             
     except Exception as e:
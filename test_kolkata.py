@@ -52,7 +52,7 @@ async def test_kolkata_weather():
         if forecasts:
             print(f"✅ Weather forecast for {forecasts[0].location}:")
             for i, forecast in enumerate(forecasts[:8]):  # Show first 8 forecasts
-                print(f"   {i+1}. {forecast.timestamp.strftime('%Y-%m-%d %H:%M')}: "
+                print(f"   {i+1}. {forecast.timestamp.strftime('%Y-%m-%d %H:%M UTC')}: "
                       f"{forecast.temperature}°C, {forecast.description}")
         else:
             print("❌ Failed to fetch weather forecast for Kolkata")
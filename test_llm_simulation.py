@@ -6,7 +6,8 @@ This script simulates how an LLM would use the weather agent
 
 import asyncio
 import json
-from datetime import datetime
+import sys
+from forecast_agg import WEEKDAY_NAMES, daily_summary
 from weather_mcp_agent import WeatherMCPAgent
 
 class LLMSimulation:
@@ -23,21 +24,27 @@ class LLMSimulation:
     async def simulate_llm_conversation(self):
         """Simulate a conversation between user, LLM, and weather agent"""
         
-        print("🤖 LLM Integration Simulation")
-        print("=" * 50)
-        print()
+        # Collect output and write it once at the end instead of per line
+        out = []
+        out.append("🤖 LLM Integration Simulation")
+        out.append("=" * 50)
+        out.append("")
         
         # Simulate user asking about weather
         user_question = "What's the weather like in London today?"
-        print(f"👤 User: {user_question}")
-        print()
+        out.append(f"👤 User: {user_question}")
+        out.append("")
         
         # LLM decides to use weather agent
-        print("🤖 LLM: I need to check the current weather for London.")
-        print("🤖 LLM: Calling weather agent...")
+        out.append("🤖 LLM: I need to check the current weather for London.")
+        out.append("🤖 LLM: Calling weather agent...")
         
-        # LLM calls weather agent
-        weather_data = await self.weather_agent.get_current_weather("London")
+        # LLM calls weather agent; the Tokyo forecast used below is independent,
+        # so fetch both concurrently
+        weather_data, forecasts = await asyncio.gather(
+            self.weather_agent.get_current_weather("London"),
+            self.weather_agent.get_forecast("Tokyo", days=5)
+        )
         
         if weather_data:
             # LLM processes the data and responds to user
@@ -51,73 +58,56 @@ class LLMSimulation:
 🌪️ Wind Speed: {weather_data.wind_speed} m/s
 📊 Pressure: {weather_data.pressure} hPa
 👁️ Visibility: {weather_data.visibility} m
-⏰ Last updated: {weather_data.timestamp.strftime('%Y-%m-%d %H:%M')}
+⏰ Last updated: {weather_data.timestamp.strftime('%Y-%m-%d %H:%M UTC')}
             """
-            print("🤖 LLM: Here's the current weather information:")
-            print(response)
+            out.append("🤖 LLM: Here's the current weather information:")
+            out.append(response)
         else:
-            print("❌ LLM: Sorry, I couldn't fetch the weather data for London.")
+            out.append("❌ LLM: Sorry, I couldn't fetch the weather data for London.")
             
-        print("-" * 50)
+        out.append("-" * 50)
         
         # Simulate user asking for forecast
         user_question2 = "What's the weather forecast for Tokyo this week?"
-        print(f"👤 User: {user_question2}")
-        print()
+        out.append(f"👤 User: {user_question2}")
+        out.append("")
         
-        print("🤖 LLM: I'll get the weather forecast for Tokyo.")
-        print("🤖 LLM: Calling weather agent for forecast...")
-        
-        # LLM calls weather agent for forecast
-        forecasts = await self.weather_agent.get_forecast("Tokyo", days=5)
+        out.append("🤖 LLM: I'll get the weather forecast for Tokyo.")
+        out.append("🤖 LLM: Calling weather agent for forecast...")
         
+        # Forecast was fetched alongside the London weather above
         if forecasts:
-            response = f"""
-📅 5-Day Weather Forecast for {forecasts[0].location}:
-
-"""
-            # Group forecasts by day
-            daily_forecasts = {}
-            for forecast in forecasts:
-                date_key = forecast.timestamp.strftime('%Y-%m-%d')
-                if date_key not in daily_forecasts:
-                    daily_forecasts[date_key] = []
-                daily_forecasts[date_key].append(forecast)
-            
-            for date, day_forecasts in list(daily_forecasts.items())[:5]:
-                avg_temp = sum(f.temperature for f in day_forecasts) / len(day_forecasts)
-                most_common_desc = max(set(f.description for f in day_forecasts), 
-                                     key=lambda x: sum(1 for f in day_forecasts if f.description == x))
-                
-                date_obj = datetime.strptime(date, '%Y-%m-%d')
-                day_name = date_obj.strftime('%A')
+            out.append("🤖 LLM: Here's the weather forecast:")
+            out.extend(("", f"📅 5-Day Weather Forecast for {forecasts[0].location}:", ""))
+            # Summarize forecasts by day
+            for date_obj, avg_temp, most_common_desc in daily_summary(forecasts)[:5]:
+                day_name = WEEKDAY_NAMES[date_obj.weekday()]
                 
-                response += f"📅 {day_name} ({date_obj.strftime('%m/%d')}): {avg_temp:.1f}°C, {most_common_desc}\n"
-            
-            print("🤖 LLM: Here's the weather forecast:")
-            print(response)
+                out.append(f"📅 {day_name} ({date_obj.month:02d}/{date_obj.day:02d}): {avg_temp:.1f}°C, {most_common_desc}")
+            out.append("")
         else:
-            print("❌ LLM: Sorry, I couldn't fetch the forecast for Tokyo.")
+            out.append("❌ LLM: Sorry, I couldn't fetch the forecast for Tokyo.")
             
-        print("-" * 50)
+        out.append("-" * 50)
         
         # Simulate MCP tool calls
-        print("🔧 MCP Tool Integration Examples:")
-        print()
+        encoder = json.JSONEncoder(indent=2, ensure_ascii=False)
+        out.append("🔧 MCP Tool Integration Examples:")
+        out.append("")
         
         # Example 1: Current weather tool call
-        print("1. LLM calls get_current_weather tool:")
+        out.append("1. LLM calls get_current_weather tool:")
         tool_call_1 = {
             "tool": "get_current_weather",
             "arguments": {
                 "location": "San Francisco"
             }
         }
-        print(json.dumps(tool_call_1, indent=2))
-        print()
+        out.append(encoder.encode(tool_call_1))
+        out.append("")
         
         # Example 2: Forecast tool call
-        print("2. LLM calls get_weather_forecast tool:")
+        out.append("2. LLM calls get_weather_forecast tool:")
         tool_call_2 = {
             "tool": "get_weather_forecast",
             "arguments": {
@@ -125,11 +115,11 @@ class LLMSimulation:
                 "days": 3
             }
         }
-        print(json.dumps(tool_call_2, indent=2))
-        print()
+        out.append(encoder.encode(tool_call_2))
+        out.append("")
         
         # Example 3: Tool response
-        print("3. Weather agent responds with data:")
+        out.append("3. Weather agent responds with data:")
         tool_response = {
             "location": "San Francisco",
             "temperature": "18.5°C",
@@ -139,19 +129,21 @@ class LLMSimulation:
             "wind_speed": "3.2 m/s",
             "pressure": "1013 hPa",
             "visibility": "10000 m",
-            "timestamp": "2024-01-15T14:30:00"
+            "timestamp": "2024-01-15T14:30:00+00:00"
         }
-        print(json.dumps(tool_response, indent=2))
-        print()
-        
-        print("✅ LLM Integration Simulation Complete!")
-        print()
-        print("📝 Key Benefits:")
-        print("• LLMs can access real-time weather data")
-        print("• Structured data format for easy processing")
-        print("• Standardized MCP interface")
-        print("• Async support for efficient operations")
-        print("• Error handling and fallbacks")
+        out.append(encoder.encode(tool_response))
+        out.append("")
+        
+        out.append("✅ LLM Integration Simulation Complete!")
+        out.append("")
+        out.append("📝 Key Benefits:")
+        out.append("• LLMs can access real-time weather data")
+        out.append("• Structured data format for easy processing")
+        out.append("• Standardized MCP interface")
+        out.append("• Async support for efficient operations")
+        out.append("• Error handling and fallbacks")
+        
+        sys.stdout.write("\n".join(out) + "\n")
 
 async def main():
     """Main function"""
@@ -6,8 +6,18 @@ Simulates how an LLM would use the weather agent
 
 import asyncio
 import json
+import sys
+from functools import lru_cache
+from forecast_agg import WEEKDAY_NAMES, daily_summary
 from weather_mcp_agent import WeatherMCPAgent
 
+# OpenWeather uses a small fixed set of descriptions, so each distinct one is
+# lowered and scanned once; repeats are a dict lookup
+@lru_cache(maxsize=None)
+def is_rainy(description: str) -> bool:
+    """Whether a weather description mentions rain"""
+    return "rain" in description.lower()
+
 class LLMWeatherTester:
     """Test LLM integration with weather agent"""
     
@@ -22,103 +32,105 @@ class LLMWeatherTester:
     async def simulate_llm_conversation(self):
         """Simulate LLM conversation with weather queries"""
         
-        print("🤖 LLM Weather Integration Test")
-        print("=" * 40)
-        print()
+        # Collect output and write it once at the end instead of per line
+        out = []
+        out.append("🤖 LLM Weather Integration Test")
+        out.append("=" * 40)
+        out.append("")
+        
+        # The scenarios below are independent, so issue all their requests at once.
+        # return_exceptions keeps one failed city from cancelling the others.
+        results = await asyncio.gather(
+            self.agent.get_current_weather("Paris"),
+            self.agent.get_current_weather("London"),
+            self.agent.get_current_weather("Tokyo"),
+            self.agent.get_forecast("New York", 5),
+            self.agent.get_current_weather("Mumbai"),
+            return_exceptions=True
+        )
+        weather, london_weather, tokyo_weather, forecast, mumbai_weather = (
+            None if isinstance(result, Exception) else result for result in results
+        )
         
         # Test 1: Simple weather query
-        print("👤 User: What's the weather in Paris?")
-        print("🤖 LLM: Let me check the current weather for Paris...")
+        out.append("👤 User: What's the weather in Paris?")
+        out.append("🤖 LLM: Let me check the current weather for Paris...")
         
-        weather = await self.agent.get_current_weather("Paris")
         if weather:
-            print(f"🤖 LLM: The weather in Paris is {weather.temperature}°C with {weather.description}.")
-            print(f"   It feels like {weather.feels_like}°C with {weather.humidity}% humidity.")
+            out.append(f"🤖 LLM: The weather in Paris is {weather.temperature}°C with {weather.description}.")
+            out.append(f"   It feels like {weather.feels_like}°C with {weather.humidity}% humidity.")
         else:
-            print("🤖 LLM: Sorry, I couldn't get the weather for Paris.")
-        print()
+            out.append("🤖 LLM: Sorry, I couldn't get the weather for Paris.")
+        out.append("")
         
         # Test 2: Weather comparison
-        print("👤 User: Compare weather in London and Tokyo")
-        print("🤖 LLM: I'll check the weather in both cities...")
-        
-        london_weather = await self.agent.get_current_weather("London")
-        tokyo_weather = await self.agent.get_current_weather("Tokyo")
+        out.append("👤 User: Compare weather in London and Tokyo")
+        out.append("🤖 LLM: I'll check the weather in both cities...")
         
         if london_weather and tokyo_weather:
-            print(f"🤖 LLM: Here's the comparison:")
-            print(f"   London: {london_weather.temperature}°C, {london_weather.description}")
-            print(f"   Tokyo: {tokyo_weather.temperature}°C, {tokyo_weather.description}")
+            out.append(f"🤖 LLM: Here's the comparison:")
+            out.append(f"   London: {london_weather.temperature}°C, {london_weather.description}")
+            out.append(f"   Tokyo: {tokyo_weather.temperature}°C, {tokyo_weather.description}")
             
             if london_weather.temperature > tokyo_weather.temperature:
-                print(f"   London is {london_weather.temperature - tokyo_weather.temperature:.1f}°C warmer than Tokyo.")
+                out.append(f"   London is {london_weather.temperature - tokyo_weather.temperature:.1f}°C warmer than Tokyo.")
             else:
-                print(f"   Tokyo is {tokyo_weather.temperature - london_weather.temperature:.1f}°C warmer than London.")
+                out.append(f"   Tokyo is {tokyo_weather.temperature - london_weather.temperature:.1f}°C warmer than London.")
         else:
-            print("🤖 LLM: Sorry, I couldn't get weather data for comparison.")
-        print()
+            out.append("🤖 LLM: Sorry, I couldn't get weather data for comparison.")
+        out.append("")
         
         # Test 3: Forecast planning
-        print("👤 User: I'm planning a trip to New York next week. What's the forecast?")
-        print("🤖 LLM: Let me get the 5-day forecast for New York...")
+        out.append("👤 User: I'm planning a trip to New York next week. What's the forecast?")
+        out.append("🤖 LLM: Let me get the 5-day forecast for New York...")
         
-        forecast = await self.agent.get_forecast("New York", 5)
         if forecast:
-            print(f"🤖 LLM: Here's the 5-day forecast for New York:")
-            daily_forecasts = {}
-            for f in forecast:
-                date_key = f.timestamp.strftime('%Y-%m-%d')
-                if date_key not in daily_forecasts:
-                    daily_forecasts[date_key] = []
-                daily_forecasts[date_key].append(f)
-            
-            for date, forecasts in list(daily_forecasts.items())[:5]:
-                avg_temp = sum(f.temperature for f in forecasts) / len(forecasts)
-                most_common = max(set(f.description for f in forecasts), 
-                                key=lambda x: sum(1 for f in forecasts if f.description == x))
-                date_obj = f.timestamp.strptime(date, '%Y-%m-%d')
-                day_name = date_obj.strftime('%A')
-                print(f"   {day_name}: {avg_temp:.1f}°C, {most_common}")
+            out.append(f"🤖 LLM: Here's the 5-day forecast for New York:")
+            for date_obj, avg_temp, most_common in daily_summary(forecast)[:5]:
+                day_name = WEEKDAY_NAMES[date_obj.weekday()]
+                out.append(f"   {day_name}: {avg_temp:.1f}°C, {most_common}")
         else:
-            print("🤖 LLM: Sorry, I couldn't get the forecast for New York.")
-        print()
+            out.append("🤖 LLM: Sorry, I couldn't get the forecast for New York.")
+        out.append("")
         
         # Test 4: Weather recommendation
-        print("👤 User: Should I bring an umbrella to Mumbai today?")
-        print("🤖 LLM: Let me check the current weather in Mumbai...")
+        out.append("👤 User: Should I bring an umbrella to Mumbai today?")
+        out.append("🤖 LLM: Let me check the current weather in Mumbai...")
         
-        mumbai_weather = await self.agent.get_current_weather("Mumbai")
         if mumbai_weather:
-            if "rain" in mumbai_weather.description.lower():
-                print(f"🤖 LLM: Yes, bring an umbrella! It's currently {mumbai_weather.description} in Mumbai.")
+            if is_rainy(mumbai_weather.description):
+                out.append(f"🤖 LLM: Yes, bring an umbrella! It's currently {mumbai_weather.description} in Mumbai.")
             elif mumbai_weather.humidity > 80:
-                print(f"🤖 LLM: Maybe bring an umbrella. It's {mumbai_weather.humidity}% humidity with {mumbai_weather.description}.")
+                out.append(f"🤖 LLM: Maybe bring an umbrella. It's {mumbai_weather.humidity}% humidity with {mumbai_weather.description}.")
             else:
-                print(f"🤖 LLM: Probably not needed. It's {mumbai_weather.description} with {mumbai_weather.humidity}% humidity.")
+                out.append(f"🤖 LLM: Probably not needed. It's {mumbai_weather.description} with {mumbai_weather.humidity}% humidity.")
         else:
-            print("🤖 LLM: Sorry, I couldn't check the weather for Mumbai.")
-        print()
+            out.append("🤖 LLM: Sorry, I couldn't check the weather for Mumbai.")
+        out.append("")
         
         # Test 5: MCP tool format
-        print("🔧 MCP Tool Examples:")
-        print("When an LLM uses the weather agent, it would call:")
-        print()
-        print("1. Current weather tool:")
+        encoder = json.JSONEncoder(indent=2, ensure_ascii=False)
+        out.append("🔧 MCP Tool Examples:")
+        out.append("When an LLM uses the weather agent, it would call:")
+        out.append("")
+        out.append("1. Current weather tool:")
         tool_call = {
             "tool": "get_current_weather",
             "arguments": {"location": "San Francisco"}
         }
-        print(json.dumps(tool_call, indent=2))
-        print()
-        print("2. Forecast tool:")
+        out.append(encoder.encode(tool_call))
+        out.append("")
+        out.append("2. Forecast tool:")
         forecast_call = {
             "tool": "get_weather_forecast", 
             "arguments": {"location": "London", "days": 3}
         }
-        print(json.dumps(forecast_call, indent=2))
-        print()
+        out.append(encoder.encode(forecast_call))
+        out.append("")
+        
+        out.append("✅ LLM Integration Test Complete!")
         
-        print("✅ LLM Integration Test Complete!")
+        sys.stdout.write("\n".join(out) + "\n")
         
     async def cleanup(self):
         """Cleanup resources"""
@@ -5,44 +5,74 @@ Simulates an MCP client interacting with the weather MCP server
 """
 
 import asyncio
+import io
+import itertools
 import json
-import subprocess
 import sys
 from typing import Dict, Any
 
+import orjson
+
 class MCPClient:
     """Simulates an MCP client"""
     
     def __init__(self):
         self.process = None
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._reader_task = None
         
     async def start_server(self):
         """Start the MCP server as a subprocess"""
-        self.process = subprocess.Popen(
-            [sys.executable, "mcp_server.py"],
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
+        self.process = await asyncio.create_subprocess_exec(
+            sys.executable, "mcp_server.py",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
         )
-        
+        self._reader_task = asyncio.create_task(self._read_loop())
+        
+    async def _read_loop(self):
+        """Read responses and resolve the pending request with the matching id"""
+        try:
+            while True:
+                line = await self.process.stdout.readline()
+                if not line:
+                    break
+                try:
+                    response = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    continue
+                future = self._pending.pop(response.get("id"), None)
+                if future and not future.done():
+                    future.set_result(response)
+        finally:
+            # Server went away: fail whatever is still waiting
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_result({"error": "No response from server"})
+            self._pending.clear()
+            
     async def send_message(self, message: Dict[str, Any]) -> Dict[str, Any]:
         """Send a message to the MCP server and get response"""
         if not self.process:
             raise Exception("Server not started")
             
-        # Send message
-        message_str = json.dumps(message) + "\n"
-        self.process.stdin.write(message_str)
-        self.process.stdin.flush()
-        
-        # Read response
-        response_line = self.process.stdout.readline()
-        if response_line:
-            return json.loads(response_line.strip())
-        else:
+        if self._reader_task.done():
             return {"error": "No response from server"}
             
+        # Responses can arrive in any order, so each request gets a unique id to match on
+        request_id = next(self._ids)
+        message = {**message, "id": request_id}
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        
+        # Send message (orjson on the wire; json.dumps is only used for display)
+        self.process.stdin.write(orjson.dumps(message) + b"\n")
+        await self.process.stdin.drain()
+        
+        return await future
+            
     async def test_initialization(self):
         """Test server initialization"""
         print("🔧 Testing MCP Server Initialization")
@@ -50,7 +80,6 @@ class MCPClient:
         
         init_message = {
             "jsonrpc": "2.0",
-            "id": 1,
             "method": "initialize",
             "params": {
                 "protocolVersion": "2024-11-05",
@@ -75,7 +104,6 @@ class MCPClient:
         
         tools_message = {
             "jsonrpc": "2.0",
-            "id": 2,
             "method": "tools/list",
             "params": {}
         }
@@ -87,13 +115,13 @@ class MCPClient:
         print()
         
     async def test_current_weather(self):
-        """Test get_current_weather tool"""
-        print("🌤️ Testing Current Weather Tool")
-        print("=" * 35)
+        """Test get_current_weather tool; returns its output so concurrent runs don't interleave"""
+        out = io.StringIO()
+        print("🌤️ Testing Current Weather Tool", file=out)
+        print("=" * 35, file=out)
         
         weather_message = {
             "jsonrpc": "2.0",
-            "id": 3,
             "method": "tools/call",
             "params": {
                 "name": "get_current_weather",
@@ -104,19 +132,20 @@ class MCPClient:
         }
         
         response = await self.send_message(weather_message)
-        print("📤 Sent get_current_weather request for London")
-        print("📥 Response:")
-        print(json.dumps(response, indent=2))
-        print()
+        print("📤 Sent get_current_weather request for London", file=out)
+        print("📥 Response:", file=out)
+        print(json.dumps(response, indent=2), file=out)
+        print(file=out)
+        return out.getvalue()
         
     async def test_weather_forecast(self):
-        """Test get_weather_forecast tool"""
-        print("📅 Testing Weather Forecast Tool")
-        print("=" * 35)
+        """Test get_weather_forecast tool; returns its output so concurrent runs don't interleave"""
+        out = io.StringIO()
+        print("📅 Testing Weather Forecast Tool", file=out)
+        print("=" * 35, file=out)
         
         forecast_message = {
             "jsonrpc": "2.0",
-            "id": 4,
             "method": "tools/call",
             "params": {
                 "name": "get_weather_forecast",
@@ -128,19 +157,20 @@ class MCPClient:
         }
         
         response = await self.send_message(forecast_message)
-        print("📤 Sent get_weather_forecast request for Tokyo (3 days)")
-        print("📥 Response:")
-        print(json.dumps(response, indent=2))
-        print()
+        print("📤 Sent get_weather_forecast request for Tokyo (3 days)", file=out)
+        print("📥 Response:", file=out)
+        print(json.dumps(response, indent=2), file=out)
+        print(file=out)
+        return out.getvalue()
         
     async def test_invalid_tool(self):
-        """Test invalid tool call"""
-        print("❌ Testing Invalid Tool Call")
-        print("=" * 30)
+        """Test invalid tool call; returns its output so concurrent runs don't interleave"""
+        out = io.StringIO()
+        print("❌ Testing Invalid Tool Call", file=out)
+        print("=" * 30, file=out)
         
         invalid_message = {
             "jsonrpc": "2.0",
-            "id": 5,
             "method": "tools/call",
             "params": {
                 "name": "invalid_tool",
@@ -149,16 +179,20 @@ class MCPClient:
         }
         
         response = await self.send_message(invalid_message)
-        print("📤 Sent invalid tool request")
-        print("📥 Response:")
-        print(json.dumps(response, indent=2))
-        print()
+        print("📤 Sent invalid tool request", file=out)
+        print("📥 Response:", file=out)
+        print(json.dumps(response, indent=2), file=out)
+        print(file=out)
+        return out.getvalue()
         
     async def cleanup(self):
         """Cleanup resources"""
+        if self._reader_task:
+            self._reader_task.cancel()
         if self.process:
-            self.process.terminate()
-            self.process.wait()
+            if self.process.returncode is None:
+                self.process.terminate()
+            await self.process.wait()
 
 async def main():
     """Main test function"""
@@ -176,9 +210,16 @@ async def main():
         # Run tests
         await client.test_initialization()
         await client.test_tools_list()
-        await client.test_current_weather()
-        await client.test_weather_forecast()
-        await client.test_invalid_tool()
+        
+        # The remaining tool calls are independent, so run them concurrently
+        # and print their buffered output in a fixed order
+        outputs = await asyncio.gather(
+            client.test_current_weather(),
+            client.test_weather_forecast(),
+            client.test_invalid_tool()
+        )
+        for output in outputs:
+            print(output, end="")
         
         print("✅ MCP Server Test Complete!")
         print()
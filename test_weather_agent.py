@@ -5,11 +5,10 @@ Test script for the Weather MCP Agent
 
 import asyncio
 import os
-from dotenv import load_dotenv
-from weather_mcp_agent import WeatherMCPAgent
 
 async def test_weather_agent():
     """Test the weather agent functionality"""
+    from dotenv import load_dotenv
     load_dotenv()
     
     # Check if API key is set
@@ -22,6 +21,9 @@ async def test_weather_agent():
     
     print("🌤️  Testing Weather MCP Agent...")
     
+    # Deferred so a missing API key exits before aiohttp is imported
+    from weather_mcp_agent import WeatherMCPAgent
+    
     # Initialize the agent
     agent = WeatherMCPAgent()
     await agent.initialize()
@@ -51,7 +53,7 @@ async def test_weather_agent():
         if forecasts:
             print(f"✅ Weather forecast for {forecasts[0].location}:")
             for i, forecast in enumerate(forecasts[:6]):  # Show first 6 forecasts
-                print(f"   {i+1}. {forecast.timestamp.strftime('%Y-%m-%d %H:%M')}: "
+                print(f"   {i+1}. {forecast.timestamp.strftime('%Y-%m-%d %H:%M UTC')}: "
                       f"{forecast.temperature}°C, {forecast.description}")
         else:
             print("❌ Failed to fetch weather forecast")
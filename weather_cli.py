@@ -6,18 +6,29 @@ Weather CLI - Command line interface for weather app
 import asyncio
 import argparse
 import sys
-from weather_mcp_agent import WeatherMCPAgent
+from typing import TYPE_CHECKING, ClassVar, Optional
+
+if TYPE_CHECKING:
+    from weather_mcp_agent import WeatherMCPAgent
 
 class WeatherCLI:
     """Command line interface for weather"""
     
-    def __init__(self):
-        self.agent = None
+    # One agent (and its pooled HTTP session) shared by every WeatherCLI in the process
+    _agent: ClassVar[Optional["WeatherMCPAgent"]] = None
+    
+    @property
+    def agent(self) -> Optional["WeatherMCPAgent"]:
+        """The shared agent, read on every call so no instance holds a closed one"""
+        return WeatherCLI._agent
         
     async def initialize(self):
         """Initialize weather agent"""
-        self.agent = WeatherMCPAgent()
-        await self.agent.initialize()
+        if WeatherCLI._agent is None:
+            # Imported here so --help and bad arguments don't pay for aiohttp/dotenv
+            from weather_mcp_agent import WeatherMCPAgent
+            WeatherCLI._agent = WeatherMCPAgent()
+            await WeatherCLI._agent.initialize()
         
     async def get_weather(self, location: str):
         """Get current weather"""
@@ -33,8 +44,9 @@ class WeatherCLI:
         
     async def cleanup(self):
         """Cleanup resources"""
-        if self.agent:
-            await self.agent.cleanup()
+        if WeatherCLI._agent:
+            await WeatherCLI._agent.cleanup()
+            WeatherCLI._agent = None
             
     def print_weather(self, weather):
         """Print weather data"""
@@ -56,7 +68,7 @@ class WeatherCLI:
         if forecasts:
             print(f"📅 {len(forecasts)}-Day Forecast for {forecasts[0].location}:")
             for i, forecast in enumerate(forecasts[:8]):
-                print(f"   {i+1}. {forecast.timestamp.strftime('%m/%d %H:%M')}: "
+                print(f"   {i+1}. {forecast.timestamp.strftime('%m/%d %H:%M UTC')}: "
                       f"{forecast.temperature}°C, {forecast.description}")
         else:
             print("❌ Failed to fetch forecast")
@@ -4,20 +4,25 @@ Weather MCP Agent - A Python-based LLM weather fetcher agent using MCP
 """
 
 import asyncio
-import json
 import logging
 import os
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Union
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 import aiohttp
-import requests
+import orjson
 from dotenv import load_dotenv
+from yarl import URL
 from mcp import ClientSession, StdioServerParameters
 from mcp.server import Server
-from mcp.server.models import InitializationOptions
 from mcp.server.stdio import stdio_server
-from pydantic import BaseModel, Field
+
+from forecast_agg import MAX_FORECAST_DAYS, valid_forecast_days
+from resilience import (RETRY_STATUSES, CircuitBreaker, CircuitOpenError, TransientError,
+                        async_with_retry, max_total_backoff)
 
 # Load environment variables
 load_dotenv()
@@ -26,8 +31,42 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class WeatherData(BaseModel):
+# Request failures the fetchers turn into a None/[] result; anything else
+# (notably asyncio.CancelledError) propagates to the caller
+FETCH_ERRORS = (TransientError, CircuitOpenError, aiohttp.ClientError, asyncio.TimeoutError)
+# Errors raised while reading fields out of an unexpected payload
+PAYLOAD_ERRORS = (KeyError, IndexError, TypeError, ValueError)
+
+# OpenWeather "dt" fields are Unix times; bound once for the per-entry forecast loops
+_fts = datetime.fromtimestamp
+_UTC = timezone.utc
+
+# Cache lifetimes (seconds) for OpenWeather responses
+CURRENT_WEATHER_TTL = 600
+FORECAST_TTL = 3600
+
+# Maximum cached entries per endpoint; least recently used entries are evicted first
+CURRENT_WEATHER_CACHE_SIZE = 256
+FORECAST_CACHE_SIZE = 128
+
+# Maximum number of concurrent upstream OpenWeather requests
+MAX_CONCURRENT_UPSTREAM = 8
+
+# Timeout (seconds) for one HTTP attempt, and how often a transient failure is retried
+ATTEMPT_TIMEOUT = 10
+MAX_RETRIES = 3
+# Worst-case duration of one upstream request: every attempt times out and
+# every backoff sleep is maximal. Callers' own deadlines should exceed this.
+UPSTREAM_BUDGET = ATTEMPT_TIMEOUT * (MAX_RETRIES + 1) + max_total_backoff(MAX_RETRIES)
+
+@dataclass(frozen=True)
+class WeatherData:
     """Weather data model"""
+    # Explicit slots (rather than slots=True, which needs Python 3.10) drop the
+    # per-instance __dict__: smaller records and faster attribute access
+    __slots__ = ("location", "temperature", "feels_like", "humidity", "description",
+                 "wind_speed", "pressure", "visibility", "timestamp")
+    
     location: str
     temperature: float
     feels_like: float
@@ -37,6 +76,80 @@ class WeatherData(BaseModel):
     pressure: int
     visibility: int
     timestamp: datetime
+    
+    # frozen + hand-written __slots__ breaks the default pickle/copy path (it sets
+    # fields with setattr); restore them the way slots=True dataclasses do
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+        
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+            
+    @classmethod
+    def from_api(cls, location: str, item: Dict[str, Any]) -> "WeatherData":
+        """Build from an OpenWeather current-weather payload or forecast list entry"""
+        # Bind the nested dicts once instead of re-indexing them per field
+        m = item["main"]
+        w = item["weather"][0]
+        wi = item["wind"]
+        return cls(
+            location=location,
+            temperature=m["temp"],
+            feels_like=m["feels_like"],
+            humidity=m["humidity"],
+            description=w["description"],
+            wind_speed=wi["speed"],
+            pressure=m["pressure"],
+            visibility=item.get("visibility", 0),
+            timestamp=_fts(item["dt"], _UTC)
+        )
+        
+    def to_display_dict(self) -> Dict[str, Any]:
+        """Current weather as display strings with units"""
+        return {
+            "location": self.location,
+            "temperature": f"{self.temperature}°C",
+            "feels_like": f"{self.feels_like}°C",
+            "humidity": f"{self.humidity}%",
+            "description": self.description,
+            "wind_speed": f"{self.wind_speed} m/s",
+            "pressure": f"{self.pressure} hPa",
+            "visibility": f"{self.visibility} m",
+            "timestamp": self.timestamp.isoformat()
+        }
+        
+    def to_forecast_dict(self) -> Dict[str, Any]:
+        """Forecast entry as display strings with units"""
+        return {
+            "timestamp": self.timestamp.isoformat(),
+            "temperature": f"{self.temperature}°C",
+            "description": self.description,
+            "humidity": f"{self.humidity}%",
+            "wind_speed": f"{self.wind_speed} m/s"
+        }
+
+def _forecast_entry(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Forecast list entry as display strings; same shape as WeatherData.to_forecast_dict"""
+    m = item["main"]
+    return {
+        "timestamp": _fts(item["dt"], _UTC).isoformat(),
+        "temperature": f"{m['temp']}°C",
+        "description": item["weather"][0]["description"],
+        "humidity": f"{m['humidity']}%",
+        "wind_speed": f"{item['wind']['speed']} m/s"
+    }
+
+async def run_concurrently(*aws: Awaitable[Any]) -> List[Any]:
+    """Await several coroutines concurrently and return their results in order.
+    
+    Uses asyncio.TaskGroup on Python 3.11+ and asyncio.gather otherwise.
+    """
+    if hasattr(asyncio, "TaskGroup"):
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(aw) for aw in aws]
+        return [task.result() for task in tasks]
+    return list(await asyncio.gather(*aws))
 
 class WeatherMCPAgent:
     """MCP Weather Agent for fetching and providing weather data to LLMs"""
@@ -44,99 +157,219 @@ class WeatherMCPAgent:
     def __init__(self):
         self.api_key = os.getenv("OPENWEATHER_API_KEY")
         self.base_url = "http://api.openweathermap.org/data/2.5"
+        # Parsed once; each request only adds its query string
+        self._weather_url = URL(self.base_url + "/weather")
+        self._forecast_url = URL(self.base_url + "/forecast")
         self.session = None
+        self._warmup_task = None
+        self.breaker = CircuitBreaker()
+        # Bulkhead: bound in-flight network calls so bursts can't exhaust sockets or
+        # trigger 429s; cache hits and coalesced callers never take a permit
+        self._bulkhead = asyncio.Semaphore(MAX_CONCURRENT_UPSTREAM)
+        self._cur_cache: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+        self._cw_cache: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+        self._fc_cache: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
         
     async def initialize(self):
         """Initialize the agent"""
-        self.session = aiohttp.ClientSession()
+        if self.session and not self.session.closed:
+            return
+            
+        # One pooled session for all requests; keep-alive lets repeat calls reuse TCP/TLS
+        connector = aiohttp.TCPConnector(limit=32, limit_per_host=8, ttl_dns_cache=300,
+                                         keepalive_timeout=75, enable_cleanup_closed=True)
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=ATTEMPT_TIMEOUT, connect=3),
+            # Ask for compressed JSON explicitly; aiohttp decompresses transparently
+            headers={
+                "Accept-Encoding": "gzip, deflate",
+                "Accept": "application/json",
+                "User-Agent": "weather-mcp-agent/1.0"
+            }
+        )
+        # Not awaited: DNS and the TCP handshake overlap with the caller's own
+        # setup, so the first real request finds a keep-alive connection in the pool
+        self._warmup_task = asyncio.create_task(self._warm_up())
         logger.info("Weather MCP Agent initialized")
         
+    async def _warm_up(self):
+        """Open a pooled connection to the API host ahead of the first request"""
+        try:
+            async with self.session.head(self.base_url, allow_redirects=False,
+                                         timeout=aiohttp.ClientTimeout(total=5)):
+                pass
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.debug("Connection warm-up failed: %s", e)
+            
     async def cleanup(self):
         """Cleanup resources"""
-        if self.session:
+        if self._warmup_task:
+            self._warmup_task.cancel()
+            self._warmup_task = None
+        if self.session and not self.session.closed:
             await self.session.close()
             
+    async def __aenter__(self) -> "WeatherMCPAgent":
+        await self.initialize()
+        return self
+        
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.cleanup()
+            
+    async def _get_json(self, url: URL) -> Tuple[int, Optional[Dict[str, Any]]]:
+        """GET a JSON endpoint, retrying transient failures with backoff.
+        
+        Calls go through the agent's circuit breaker, which raises
+        CircuitOpenError without touching the network after repeated failures,
+        and hold a bulkhead permit while on the network.
+        Returns (status, data); data is None for non-200 responses.
+        """
+        async def fetch():
+            try:
+                async with self.session.get(url) as response:
+                    if response.status in RETRY_STATUSES:
+                        raise TransientError(f"HTTP {response.status}")
+                    if response.status != 200:
+                        return response.status, None
+                    return response.status, await response.json(loads=orjson.loads)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                raise TransientError(str(e)) from e
+                
+        async with self.breaker.guard():
+            async with self._bulkhead:
+                return await async_with_retry(fetch, max_retries=MAX_RETRIES)
+            
+    async def _cached(self, cache: "OrderedDict[Tuple, Tuple[float, Any]]", maxsize: int, key: Tuple,
+                      ttl: float, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Return a fresh cached value for key, or fetch and cache it (TTL + LRU)"""
+        entry = cache.get(key)
+        if entry and time.monotonic() - entry[0] < ttl:
+            cache.move_to_end(key)
+            return entry[1]
+            
+        # Single-flight: concurrent misses for the same key await one shared fetch
+        # task. Every caller, the first included, awaits it through shield(), so
+        # cancelling any one caller never cancels the fetch the others wait on.
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_and_store(cache, maxsize, key, fetch))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._inflight_done(key, done))
+        return await asyncio.shield(task)
+        
+    async def _fetch_and_store(self, cache: "OrderedDict[Tuple, Tuple[float, Any]]", maxsize: int,
+                               key: Tuple, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Fetch a value and store it in the LRU cache if it is non-empty"""
+        result = await fetch()
+        if result:
+            cache[key] = (time.monotonic(), result)
+            cache.move_to_end(key)
+            if len(cache) > maxsize:
+                cache.popitem(last=False)
+        return result
+        
+    def _inflight_done(self, key: Tuple, task: "asyncio.Future") -> None:
+        """Forget a finished fetch task"""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # Mark retrieved in case every waiter was cancelled
+            
     async def get_current_weather(self, location: str) -> Optional[WeatherData]:
+        """Get current weather data for a location, cached for CURRENT_WEATHER_TTL"""
+        key = ("current", location.strip().lower())
+        return await self._cached(self._cur_cache, CURRENT_WEATHER_CACHE_SIZE, key, CURRENT_WEATHER_TTL,
+                                  lambda: self._fetch_current_weather(location))
+        
+    async def get_current_weather_display(self, location: str) -> Optional[Dict[str, Any]]:
+        """Get current weather as a display dict, cached for CURRENT_WEATHER_TTL
+        
+        Same result as get_current_weather(...).to_display_dict(), but the
+        formatted dict itself is cached so hits skip the formatting too.
+        """
+        key = ("current_display", location.strip().lower())
+        return await self._cached(self._cw_cache, CURRENT_WEATHER_CACHE_SIZE, key, CURRENT_WEATHER_TTL,
+                                  lambda: self._fetch_current_display(location))
+        
+    async def get_forecast(self, location: str, days: int = 5) -> List[WeatherData]:
+        """Get weather forecast for a location, cached for FORECAST_TTL"""
+        key = ("forecast", location.strip().lower(), days)
+        return await self._cached(self._fc_cache, FORECAST_CACHE_SIZE, key, FORECAST_TTL,
+                                  lambda: self._fetch_forecast(location, days))
+        
+    async def get_forecast_raw(self, location: str, days: int = 5) -> List[Dict[str, Any]]:
+        """Get weather forecast entries as display dicts, cached for FORECAST_TTL
+        
+        Same result as calling to_forecast_dict() on each get_forecast entry, but
+        built straight from the JSON without intermediate WeatherData objects.
+        """
+        key = ("forecast_raw", location.strip().lower(), days)
+        return await self._cached(self._fc_cache, FORECAST_CACHE_SIZE, key, FORECAST_TTL,
+                                  lambda: self._fetch_forecast(location, days, raw=True))
+        
+    async def _fetch_current_weather(self, location: str) -> Optional[WeatherData]:
         """Fetch current weather data for a location"""
         if not self.api_key:
             logger.error("OpenWeather API key not found. Please set OPENWEATHER_API_KEY environment variable.")
             return None
             
         try:
-            url = f"{self.base_url}/weather"
-            params = {
-                "q": location,
-                "appid": self.api_key,
-                "units": "metric"
-            }
+            url = self._weather_url.with_query(q=location, appid=self.api_key, units="metric")
             
-            async with self.session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    
-                    weather_data = WeatherData(
-                        location=location,
-                        temperature=data["main"]["temp"],
-                        feels_like=data["main"]["feels_like"],
-                        humidity=data["main"]["humidity"],
-                        description=data["weather"][0]["description"],
-                        wind_speed=data["wind"]["speed"],
-                        pressure=data["main"]["pressure"],
-                        visibility=data.get("visibility", 0),
-                        timestamp=datetime.fromtimestamp(data["dt"])
-                    )
-                    
-                    logger.info(f"Weather data fetched for {location}")
-                    return weather_data
-                else:
-                    logger.error(f"Failed to fetch weather data for {location}: {response.status}")
-                    return None
+            status, data = await self._get_json(url)
+            if status == 200:
+                weather_data = WeatherData.from_api(location, data)
+                
+                logger.info("Weather data fetched for %s", location)
+                return weather_data
+            else:
+                logger.error("Failed to fetch weather data for %s: %s", location, status)
+                return None
                     
-        except Exception as e:
-            logger.error(f"Error fetching weather data: {e}")
+        except FETCH_ERRORS as e:
+            logger.error("Error fetching weather data: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
+            return None
+        except PAYLOAD_ERRORS as e:
+            logger.error("Malformed weather data for %s: %s", location, e, exc_info=logger.isEnabledFor(logging.DEBUG))
             return None
             
-    async def get_forecast(self, location: str, days: int = 5) -> List[WeatherData]:
-        """Fetch weather forecast for a location"""
+    async def _fetch_current_display(self, location: str) -> Optional[Dict[str, Any]]:
+        """Fetch current weather for a location, formatted as a display dict"""
+        weather_data = await self._fetch_current_weather(location)
+        return weather_data.to_display_dict() if weather_data else None
+        
+    async def _fetch_forecast(self, location: str, days: int = 5, raw: bool = False) -> List[Any]:
+        """Fetch weather forecast for a location, as WeatherData or (raw) display dicts"""
         if not self.api_key:
             logger.error("OpenWeather API key not found")
             return []
             
         try:
-            url = f"{self.base_url}/forecast"
-            params = {
-                "q": location,
-                "appid": self.api_key,
-                "units": "metric"
-            }
+            # cnt has the API return only the entries we keep (8 per day)
+            url = self._forecast_url.with_query(q=location, appid=self.api_key, units="metric",
+                                                cnt=days * 8)
             
-            async with self.session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    forecasts = []
-                    
-                    for item in data["list"][:days * 8]:  # 8 forecasts per day
-                        forecast = WeatherData(
-                            location=location,
-                            temperature=item["main"]["temp"],
-                            feels_like=item["main"]["feels_like"],
-                            humidity=item["main"]["humidity"],
-                            description=item["weather"][0]["description"],
-                            wind_speed=item["wind"]["speed"],
-                            pressure=item["main"]["pressure"],
-                            visibility=item.get("visibility", 0),
-                            timestamp=datetime.fromtimestamp(item["dt"])
-                        )
-                        forecasts.append(forecast)
-                    
-                    logger.info(f"Forecast data fetched for {location}")
-                    return forecasts
+            status, data = await self._get_json(url)
+            if status == 200:
+                items = data["list"][:days * 8]  # 8 forecasts per day
+                if raw:
+                    forecasts = [_forecast_entry(item) for item in items]
                 else:
-                    logger.error(f"Failed to fetch forecast for {location}: {response.status}")
-                    return []
+                    forecasts = [WeatherData.from_api(location, item) for item in items]
+                
+                logger.info("Forecast data fetched for %s", location)
+                return forecasts
+            else:
+                logger.error("Failed to fetch forecast for %s: %s", location, status)
+                return []
                     
-        except Exception as e:
-            logger.error(f"Error fetching forecast: {e}")
+        except FETCH_ERRORS as e:
+            logger.error("Error fetching forecast: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
+            return []
+        except PAYLOAD_ERRORS as e:
+            logger.error("Malformed forecast data for %s: %s", location, e, exc_info=logger.isEnabledFor(logging.DEBUG))
             return []
 
 class WeatherMCPServer:
@@ -163,61 +396,69 @@ class WeatherMCPServer:
             self.get_forecast_tool
         )
         
+        self.server.tool(
+            "get_weather_report",
+            "Get current weather and forecast for a location in one call",
+            self.get_weather_report_tool
+        )
+        
         logger.info("Weather MCP Server initialized")
         
     async def get_current_weather_tool(self, location: str) -> Dict[str, Any]:
         """MCP tool for getting current weather"""
-        weather_data = await self.weather_agent.get_current_weather(location)
+        weather_data = await self.weather_agent.get_current_weather_display(location)
         
         if weather_data:
-            return {
-                "location": weather_data.location,
-                "temperature": f"{weather_data.temperature}°C",
-                "feels_like": f"{weather_data.feels_like}°C",
-                "humidity": f"{weather_data.humidity}%",
-                "description": weather_data.description,
-                "wind_speed": f"{weather_data.wind_speed} m/s",
-                "pressure": f"{weather_data.pressure} hPa",
-                "visibility": f"{weather_data.visibility} m",
-                "timestamp": weather_data.timestamp.isoformat()
-            }
+            return weather_data
         else:
             return {"error": f"Failed to fetch weather data for {location}"}
             
     async def get_forecast_tool(self, location: str, days: int = 5) -> Dict[str, Any]:
         """MCP tool for getting weather forecast"""
-        forecasts = await self.weather_agent.get_forecast(location, days)
+        forecasts = await self.weather_agent.get_forecast_raw(location, days)
         
         if forecasts:
-            forecast_data = []
-            for forecast in forecasts:
-                forecast_data.append({
-                    "timestamp": forecast.timestamp.isoformat(),
-                    "temperature": f"{forecast.temperature}°C",
-                    "description": forecast.description,
-                    "humidity": f"{forecast.humidity}%",
-                    "wind_speed": f"{forecast.wind_speed} m/s"
-                })
-            
             return {
                 "location": location,
-                "forecast": forecast_data
+                "forecast": forecasts
             }
         else:
             return {"error": f"Failed to fetch forecast for {location}"}
             
+    async def get_weather_report_tool(self, location: str, days: int = 5) -> Dict[str, Any]:
+        """MCP tool for getting current weather and forecast together
+        
+        current and forecast hold what get_current_weather and
+        get_weather_forecast return, including their error dicts.
+        """
+        if not valid_forecast_days(days):
+            return {"error": f"days must be an integer from 1 to {MAX_FORECAST_DAYS}"}
+            
+        # Both requests are in flight at once, so the report costs one round trip
+        current, forecast = await run_concurrently(
+            self.get_current_weather_tool(location),
+            self.get_forecast_tool(location, days)
+        )
+        return {
+            "location": location,
+            "current": current,
+            "forecast": forecast
+        }
+        
     async def run(self):
         """Run the MCP server"""
-        await self.initialize()
-        
-        async with stdio_server() as (read_stream, write_stream):
-            async with ClientSession(
-                StdioServerParameters(
-                    read_stream=read_stream,
-                    write_stream=write_stream
-                )
-            ) as session:
-                await self.server.run(session)
+        # The agent's HTTP session is closed however the server exits
+        async with self.weather_agent:
+            await self.initialize()
+            
+            async with stdio_server() as (read_stream, write_stream):
+                async with ClientSession(
+                    StdioServerParameters(
+                        read_stream=read_stream,
+                        write_stream=write_stream
+                    )
+                ) as session:
+                    await self.server.run(session)
                 
     async def cleanup(self):
         """Cleanup resources"""